@@ -0,0 +1,42 @@
+"""One-off migration: convert "YYYY-MM-DD" string dates to BSON dates.
+
+Run once from the backend directory, with the same MONGO_URL/DB_NAME as the API:
+
+    python migrate_dates.py
+"""
+import asyncio
+
+from pymongo import UpdateOne
+
+from server import db, parse_transaction_date
+
+# Updates are sent in bounded chunks so no single call holds the whole collection
+MIGRATION_BATCH_SIZE = 1000
+
+async def migrate_string_dates(collection, batch_size: int = MIGRATION_BATCH_SIZE) -> int:
+    """Convert string-dated transactions to BSON dates and return how many were updated"""
+    # Parsed in Python so stored dates follow the same rules as API input
+    migrated = 0
+    updates = []
+    async for transaction in collection.find({"date": {"$type": "string"}}, {"date": 1}):
+        try:
+            parsed = parse_transaction_date(transaction["date"])
+        except ValueError:
+            # Leave unparseable dates as they are
+            continue
+        updates.append(UpdateOne({"_id": transaction["_id"]}, {"$set": {"date": parsed}}))
+        
+        if len(updates) >= batch_size:
+            await collection.bulk_write(updates, ordered=False)
+            migrated += len(updates)
+            updates = []
+    
+    if updates:
+        await collection.bulk_write(updates, ordered=False)
+        migrated += len(updates)
+    
+    return migrated
+
+if __name__ == "__main__":
+    count = asyncio.run(migrate_string_dates(db.transactions))
+    print(f"Migrated {count} transaction dates")
@@ -1,49 +1,84 @@
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pymongo import MongoClient
-from pydantic import BaseModel, Field
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional, List
-from datetime import datetime
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta
+import asyncio
+import functools
+import orjson
 import os
 import uuid
 import re
+import time
 from typing import Dict, Any
 
 # Database connection
 MONGO_URL = os.environ.get('MONGO_URL', 'mongodb://localhost:27017')
 DB_NAME = os.environ.get('DB_NAME', 'test_database')
+# Pool sizes are per worker process; keep max >= expected in-flight DB ops
+MONGO_MAX_POOL_SIZE = int(os.environ.get('MONGO_MAX_POOL_SIZE', '50'))
+MONGO_MIN_POOL_SIZE = int(os.environ.get('MONGO_MIN_POOL_SIZE', '10'))
 
-client = MongoClient(MONGO_URL)
+client = AsyncIOMotorClient(
+    MONGO_URL,
+    maxPoolSize=MONGO_MAX_POOL_SIZE,
+    minPoolSize=MONGO_MIN_POOL_SIZE,
+    maxIdleTimeMS=60000,
+    socketTimeoutMS=5000,
+    serverSelectionTimeoutMS=3000,
+    retryWrites=True
+)
 db = client[DB_NAME]
 
-app = FastAPI()
+def parse_transaction_date(value: Any) -> Any:
+    """Convert a "YYYY-MM-DD" string into a midnight datetime for storage"""
+    if isinstance(value, str):
+        # Date-only parsing: times and UTC offsets would shift the stored day
+        return datetime.combine(date.fromisoformat(value), datetime.min.time())
+    return value
 
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+def format_transaction(transaction: Dict[str, Any]) -> Dict[str, Any]:
+    """Render a stored BSON date back as the "YYYY-MM-DD" string clients expect"""
+    if isinstance(transaction.get("date"), datetime):
+        transaction["date"] = transaction["date"].date().isoformat()
+    return transaction
+
+# today() runs on every SMS/webhook write, so it is only recomputed at midnight
+_today_cache = {"until": 0.0, "val": None}
+
+def today() -> datetime:
+    """Today's date as a midnight datetime"""
+    if time.time() >= _today_cache["until"]:
+        midnight = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        _today_cache.update(until=(midnight + timedelta(days=1)).timestamp(), val=midnight)
+    return _today_cache["val"]
 
 # Pydantic models
 class Transaction(BaseModel):
     id: Optional[str] = Field(default_factory=lambda: str(uuid.uuid4()))
     amount: float
     description: str
-    date: str
+    date: datetime  # stored as a BSON date so it can be indexed and range-queried
     category: str
     type: str  # "expense" or "income"
     created_at: Optional[str] = Field(default_factory=lambda: datetime.now().isoformat())
 
+    _parse_date = field_validator("date", mode="before")(parse_transaction_date)
+
 class TransactionUpdate(BaseModel):
     amount: Optional[float] = None
     description: Optional[str] = None
-    date: Optional[str] = None
+    date: Optional[datetime] = None
     category: Optional[str] = None
     type: Optional[str] = None
 
+    _parse_date = field_validator("date", mode="before")(parse_transaction_date)
+
 class SMSData(BaseModel):
     message: str
     sender: Optional[str] = None
@@ -79,14 +114,23 @@ PAYMENT_SERVICES = {
     }
 }
 
-# SMS parsing patterns for different banks
-SMS_PATTERNS = {
-    "sbi": r"Rs\.(\d+(?:\.\d{2})?).+?(?:spent|debited).+?(?:at|on)\s+(.+?)(?:\s+on|\s+UPI|\s+Card|\.|$)",
-    "hdfc": r"Rs\s*(\d+(?:\.\d{2})?).+?(?:spent|debited).+?(?:at|on)\s+(.+?)(?:\s+on|\s+UPI|\s+Card|\.|$)",
-    "icici": r"Rs\.(\d+(?:\.\d{2})?).+?(?:spent|debited).+?(?:at|on)\s+(.+?)(?:\s+on|\s+UPI|\s+Card|\.|$)",
-    "axis": r"INR\s*(\d+(?:\.\d{2})?).+?(?:spent|debited).+?(?:at|on)\s+(.+?)(?:\s+on|\s+UPI|\s+Card|\.|$)",
-    "generic": r"(?:Rs\.?|INR)\s*(\d+(?:\.\d{2})?).+?(?:spent|debited|paid).+?(?:at|on|to)\s+(.+?)(?:\s+on|\s+UPI|\s+Card|\.|$)"
-}
+# Constant endpoints have their response bodies serialized once at import.
+# A fresh Response wraps the bytes per request because middleware (CORS)
+# appends headers to the response's header list in place.
+_ROOT_BYTES = orjson.dumps({"message": "Finance Tracker API"})
+_PAYMENT_SERVICES_BYTES = orjson.dumps({"services": PAYMENT_SERVICES})
+
+# SMS parsing pattern used for every bank, in a single pass over the text.
+# This replaced per-bank patterns that were tried first when the sender named
+# a bank. Those only accepted "at"/"on" before the merchant, so some messages
+# now capture a different merchant, e.g. "Rs.500 debited from A/c XX12 to Uber
+# on 01-01" gives "Uber" (was "01-01") and "Rs.500 debited to A/c at Biryani
+# House on 03" gives "A/c at Biryani House" (was "Biryani House").
+_COMBINED_SMS_RE = re.compile(
+    r"(?:Rs\.?|INR)\s*(?P<amt>\d+(?:\.\d{2})?).+?(?:spent|debited|paid).+?(?:at|on|to)\s+(?P<merch>.+?)(?:\s+on|\s+UPI|\s+Card|\.|$)",
+    re.IGNORECASE
+)
+_WS_RE = re.compile(r'\s+')
 
 def parse_sms_transaction(sms_text: str, sender: str = None) -> Optional[Dict[str, Any]]:
     """Parse SMS text to extract transaction details"""
@@ -94,78 +138,173 @@ def parse_sms_transaction(sms_text: str, sender: str = None) -> Optional[Dict[st
         # Clean the SMS text
         sms_text = sms_text.strip()
         
-        # Try different patterns based on sender or use generic
-        patterns_to_try = []
-        if sender:
-            sender_lower = sender.lower()
-            for bank, pattern in SMS_PATTERNS.items():
-                if bank in sender_lower:
-                    patterns_to_try.append(pattern)
+        match = _COMBINED_SMS_RE.search(sms_text)
+        if not match:
+            return None
         
-        # Add generic pattern as fallback
-        patterns_to_try.append(SMS_PATTERNS["generic"])
+        amount = float(match.group("amt"))
+        merchant = match.group("merch").strip()
         
-        for pattern in patterns_to_try:
-            match = re.search(pattern, sms_text, re.IGNORECASE)
-            if match:
-                amount = float(match.group(1))
-                merchant = match.group(2).strip()
-                
-                # Clean merchant name
-                merchant = re.sub(r'\s+', ' ', merchant)
-                merchant = merchant.replace('*', '').strip()
-                
-                # Auto-categorize based on merchant
-                category = auto_categorize_transaction(merchant)
-                
-                return {
-                    "amount": amount,
-                    "description": f"Payment to {merchant}",
-                    "merchant": merchant,
-                    "category": category,
-                    "type": "expense",
-                    "date": datetime.now().strftime("%Y-%m-%d"),
-                    "source": "sms"
-                }
+        # Clean merchant name
+        merchant = _WS_RE.sub(' ', merchant)
+        merchant = merchant.replace('*', '').strip()
         
-        return None
+        # Auto-categorize based on merchant
+        category = auto_categorize_transaction(merchant)
+        
+        return {
+            "amount": amount,
+            "description": f"Payment to {merchant}",
+            "merchant": merchant,
+            "category": category,
+            "type": "expense",
+            "date": today(),
+            "source": "sms"
+        }
     except Exception as e:
         print(f"Error parsing SMS: {e}")
         return None
 
+# Merchant keywords per category, checked in priority order
+CATEGORY_KEYWORDS = {
+    "Food": ['swiggy', 'zomato', 'uber eats', 'dominos', 'pizza', 'restaurant', 'cafe', 'food', 'kitchen', 'biryani'],
+    "Transport": ['uber', 'ola', 'rapido', 'metro', 'bus', 'taxi', 'petrol', 'fuel'],
+    "Shopping": ['amazon', 'flipkart', 'myntra', 'ajio', 'shopping', 'mall', 'store'],
+    "Bills": ['electricity', 'water', 'gas', 'internet', 'mobile', 'recharge', 'bill']
+}
+
+# One alternation per category, so each category costs a single scan
+_CATEGORY_PATTERNS = [
+    (category, re.compile('|'.join(re.escape(keyword) for keyword in keywords)))
+    for category, keywords in CATEGORY_KEYWORDS.items()
+]
+
 def auto_categorize_transaction(merchant: str) -> str:
     """Auto-categorize transaction based on merchant name"""
-    merchant_lower = merchant.lower()
-    
-    # Food delivery and restaurants
-    if any(keyword in merchant_lower for keyword in ['swiggy', 'zomato', 'uber eats', 'dominos', 'pizza', 'restaurant', 'cafe', 'food', 'kitchen', 'biryani']):
-        return "Food"
-    
-    # Transportation
-    elif any(keyword in merchant_lower for keyword in ['uber', 'ola', 'rapido', 'metro', 'bus', 'taxi', 'petrol', 'fuel']):
-        return "Transport"
-    
-    # Shopping
-    elif any(keyword in merchant_lower for keyword in ['amazon', 'flipkart', 'myntra', 'ajio', 'shopping', 'mall', 'store']):
-        return "Shopping"
-    
-    # Bills and utilities
-    elif any(keyword in merchant_lower for keyword in ['electricity', 'water', 'gas', 'internet', 'mobile', 'recharge', 'bill']):
-        return "Bills"
+    return _categorize_merchant(merchant.lower())
+
+# Recurring merchants make this a hash lookup instead of a keyword scan
+@functools.lru_cache(maxsize=2048)
+def _categorize_merchant(merchant_lower: str) -> str:
+    for category, pattern in _CATEGORY_PATTERNS:
+        if pattern.search(merchant_lower):
+            return category
     
     # Default category
-    else:
-        return "Others"
+    return "Others"
+
+async def create_indexes():
+    """Create the indexes the API queries rely on"""
+    await db.transactions.create_index("id", unique=True)
+    await db.transactions.create_index([("type", 1), ("category", 1)])
+    await db.transactions.create_index([("date", -1)])
+
+# Micro-batching for SMS/webhook inserts: bursts of writes are collected for
+# a short window and flushed with a single insert_many
+INSERT_BATCH_SIZE = 100
+INSERT_BATCH_WINDOW = 0.005  # seconds
+
+_insert_queue: Optional[asyncio.Queue] = None
+_insert_worker: Optional[asyncio.Task] = None
+# Queued by stop_insert_batcher; the worker flushes its current batch and exits
+_STOP_INSERTS = object()
+
+async def queue_insert(document: Dict[str, Any]) -> None:
+    """Queue a document for the next batched insert and wait until it is written"""
+    future = asyncio.get_running_loop().create_future()
+    await _insert_queue.put((document, future))
+    await future
+
+async def _flush_inserts(batch: List[tuple]) -> None:
+    """Insert a batch of queued documents and resolve each caller's future"""
+    failed = {}
+    try:
+        await db.transactions.insert_many([document for document, _ in batch], ordered=False)
+    except BulkWriteError as e:
+        for error in e.details.get("writeErrors", []):
+            failed[error["index"]] = Exception(error.get("errmsg", "Insert failed"))
+    except Exception as e:
+        failed = {index: e for index in range(len(batch))}
+    
+    for index, (_, future) in enumerate(batch):
+        if future.done():
+            continue
+        if index in failed:
+            future.set_exception(failed[index])
+        else:
+            future.set_result(None)
+
+async def _run_insert_batcher():
+    """Drain the insert queue in batches until the stop sentinel is reached"""
+    loop = asyncio.get_running_loop()
+    stopping = False
+    while not stopping:
+        item = await _insert_queue.get()
+        if item is _STOP_INSERTS:
+            break
+        batch = [item]
+        deadline = loop.time() + INSERT_BATCH_WINDOW
+        while len(batch) < INSERT_BATCH_SIZE:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(_insert_queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if item is _STOP_INSERTS:
+                stopping = True
+                break
+            batch.append(item)
+        await _flush_inserts(batch)
+
+async def start_insert_batcher():
+    """Start the background worker that flushes queued inserts"""
+    global _insert_queue, _insert_worker
+    _insert_queue = asyncio.Queue()
+    _insert_worker = asyncio.create_task(_run_insert_batcher())
+
+async def stop_insert_batcher():
+    """Stop the insert worker and flush anything it has not written yet"""
+    # The sentinel queues behind every pending document, so the worker writes
+    # them all (including a batch it is still collecting) before exiting
+    await _insert_queue.put(_STOP_INSERTS)
+    await _insert_worker
+    # Write anything queued after the sentinel so no caller is left waiting
+    pending = []
+    while not _insert_queue.empty():
+        pending.append(_insert_queue.get_nowait())
+    if pending:
+        await _flush_inserts(pending)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Prepare the database and insert batcher on startup, drain it on shutdown"""
+    await create_indexes()
+    await start_insert_batcher()
+    yield
+    await stop_insert_batcher()
+
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
+
+# CORS middleware
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
 
 # Routes
 @app.get("/")
 async def root():
-    return {"message": "Finance Tracker API"}
+    return Response(content=_ROOT_BYTES, media_type="application/json")
 
 @app.get("/api/payment-services")
 async def get_payment_services():
     """Get available payment services for integration"""
-    return {"services": PAYMENT_SERVICES}
+    return Response(content=_PAYMENT_SERVICES_BYTES, media_type="application/json")
 
 @app.post("/api/parse-sms")
 async def parse_sms(sms_data: SMSData):
@@ -174,25 +313,26 @@ async def parse_sms(sms_data: SMSData):
         parsed_data = parse_sms_transaction(sms_data.message, sms_data.sender)
         
         if parsed_data:
-            # Create transaction automatically
-            transaction = Transaction(
-                amount=parsed_data["amount"],
-                description=parsed_data["description"],
-                date=parsed_data["date"],
-                category=parsed_data["category"],
-                type=parsed_data["type"]
-            )
-            
-            transaction_dict = transaction.dict()
-            db.transactions.insert_one(transaction_dict)
-            
-            created_transaction = db.transactions.find_one({"id": transaction_dict["id"]}, {"_id": 0})
+            # Create transaction automatically; the parsed fields are already
+            # well-typed, so the document is built without model validation
+            transaction_dict = {
+                "id": str(uuid.uuid4()),
+                "amount": parsed_data["amount"],
+                "description": parsed_data["description"],
+                "date": parsed_data["date"],
+                "category": parsed_data["category"],
+                "type": parsed_data["type"],
+                "created_at": datetime.now().isoformat()
+            }
+            await queue_insert(transaction_dict)
+            # insert_many adds MongoDB's _id to the dict in place
+            transaction_dict.pop("_id", None)
             
             return {
                 "success": True,
                 "message": "Transaction created from SMS",
-                "transaction": created_transaction,
-                "parsed_data": parsed_data
+                "transaction": format_transaction(transaction_dict),
+                "parsed_data": format_transaction(parsed_data)
             }
         else:
             return {
@@ -213,30 +353,30 @@ async def payment_webhook(service: str, webhook_data: WebhookData):
         service_config = PAYMENT_SERVICES[service]
         
         # Create transaction from webhook data
-        transaction = Transaction(
-            amount=webhook_data.amount,
-            description=f"{service_config['name']} payment to {webhook_data.merchant}",
-            date=datetime.now().strftime("%Y-%m-%d"),
-            category=service_config["category"],
-            type="expense"
-        )
-        
-        transaction_dict = transaction.dict()
-        # Add webhook metadata
-        transaction_dict["webhook_data"] = {
-            "service": service,
-            "transaction_id": webhook_data.transaction_id,
-            "merchant": webhook_data.merchant,
-            "timestamp": webhook_data.timestamp
+        transaction_dict = {
+            "id": str(uuid.uuid4()),
+            "amount": webhook_data.amount,
+            "description": f"{service_config['name']} payment to {webhook_data.merchant}",
+            "date": today(),
+            "category": service_config["category"],
+            "type": "expense",
+            "created_at": datetime.now().isoformat(),
+            # Add webhook metadata
+            "webhook_data": {
+                "service": service,
+                "transaction_id": webhook_data.transaction_id,
+                "merchant": webhook_data.merchant,
+                "timestamp": webhook_data.timestamp
+            }
         }
         
-        db.transactions.insert_one(transaction_dict)
-        created_transaction = db.transactions.find_one({"id": transaction_dict["id"]}, {"_id": 0})
+        await queue_insert(transaction_dict)
+        transaction_dict.pop("_id", None)
         
         return {
             "success": True,
             "message": f"Transaction created from {service_config['name']} webhook",
-            "transaction": created_transaction
+            "transaction": format_transaction(transaction_dict)
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -259,58 +399,60 @@ async def sync_payments():
 @app.get("/api/transactions")
 async def get_transactions():
     try:
-        transactions = list(db.transactions.find({}, {"_id": 0}))
         # Sort by date descending (newest first)
-        transactions.sort(key=lambda x: x.get('date', ''), reverse=True)
-        return {"transactions": transactions}
+        cursor = db.transactions.find({}, {"_id": 0}).sort("date", -1)
+        transactions = await cursor.to_list(length=None)
+        return {"transactions": [format_transaction(t) for t in transactions]}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/transactions")
 async def create_transaction(transaction: Transaction):
     try:
-        transaction_dict = transaction.dict()
-        db.transactions.insert_one(transaction_dict)
+        transaction_dict = transaction.model_dump()
+        await db.transactions.insert_one(transaction_dict)
         # Return the transaction without MongoDB's _id field
-        created_transaction = db.transactions.find_one({"id": transaction_dict["id"]}, {"_id": 0})
-        return {"message": "Transaction created successfully", "transaction": created_transaction}
+        transaction_dict.pop("_id", None)
+        return {"message": "Transaction created successfully", "transaction": format_transaction(transaction_dict)}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/transactions/{transaction_id}")
 async def get_transaction(transaction_id: str):
     try:
-        transaction = db.transactions.find_one({"id": transaction_id}, {"_id": 0})
+        transaction = await db.transactions.find_one({"id": transaction_id}, {"_id": 0})
         if not transaction:
             raise HTTPException(status_code=404, detail="Transaction not found")
-        return transaction
+        return format_transaction(transaction)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.put("/api/transactions/{transaction_id}")
 async def update_transaction(transaction_id: str, transaction_update: TransactionUpdate):
     try:
-        update_data = {k: v for k, v in transaction_update.dict().items() if v is not None}
+        # Nulls are still dropped so a client can't blank out required fields
+        update_data = transaction_update.model_dump(exclude_unset=True, exclude_none=True)
         if not update_data:
             raise HTTPException(status_code=400, detail="No fields to update")
         
-        result = db.transactions.update_one(
+        updated_transaction = await db.transactions.find_one_and_update(
             {"id": transaction_id},
-            {"$set": update_data}
+            {"$set": update_data},
+            projection={"_id": 0},
+            return_document=ReturnDocument.AFTER
         )
         
-        if result.matched_count == 0:
+        if updated_transaction is None:
             raise HTTPException(status_code=404, detail="Transaction not found")
         
-        updated_transaction = db.transactions.find_one({"id": transaction_id}, {"_id": 0})
-        return {"message": "Transaction updated successfully", "transaction": updated_transaction}
+        return {"message": "Transaction updated successfully", "transaction": format_transaction(updated_transaction)}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.delete("/api/transactions/{transaction_id}")
 async def delete_transaction(transaction_id: str):
     try:
-        result = db.transactions.delete_one({"id": transaction_id})
+        result = await db.transactions.delete_one({"id": transaction_id})
         if result.deleted_count == 0:
             raise HTTPException(status_code=404, detail="Transaction not found")
         return {"message": "Transaction deleted successfully"}
@@ -320,19 +462,33 @@ async def delete_transaction(transaction_id: str):
 @app.get("/api/summary")
 async def get_summary():
     try:
-        transactions = list(db.transactions.find({}, {"_id": 0}))
+        pipeline = [
+            # Only the fields the totals depend on are read from each document
+            {"$project": {"_id": 0, "type": 1, "category": 1, "amount": 1}},
+            {"$group": {
+                "_id": {"category": "$category", "type": "$type"},
+                "total": {"$sum": "$amount"}
+            }}
+        ]
         
-        total_income = sum(t['amount'] for t in transactions if t['type'] == 'income')
-        total_expenses = sum(t['amount'] for t in transactions if t['type'] == 'expense')
-        balance = total_income - total_expenses
+        total_income = 0
+        total_expenses = 0
         
         # Category-wise breakdown
         category_breakdown = {}
-        for transaction in transactions:
-            category = transaction['category']
+        async for group in db.transactions.aggregate(pipeline):
+            category = group['_id']['category']
+            transaction_type = group['_id']['type']
             if category not in category_breakdown:
                 category_breakdown[category] = {'income': 0, 'expense': 0}
-            category_breakdown[category][transaction['type']] += transaction['amount']
+            category_breakdown[category][transaction_type] += group['total']
+            
+            if transaction_type == 'income':
+                total_income += group['total']
+            elif transaction_type == 'expense':
+                total_expenses += group['total']
+        
+        balance = total_income - total_expenses
         
         return {
             "total_income": total_income,
@@ -345,4 +501,13 @@ async def get_summary():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8001)
\ No newline at end of file
+    # Multiple workers need the app as an import string; each worker gets its
+    # own event loop and Mongo connection pool
+    uvicorn.run(
+        "server:app",
+        host="0.0.0.0",
+        port=8001,
+        workers=int(os.environ.get('WEB_CONCURRENCY', os.cpu_count() or 1)),
+        loop="uvloop",
+        http="httptools"
+    )
\ No newline at end of file
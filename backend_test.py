@@ -1,4 +1,5 @@
 import requests
+from requests.adapters import HTTPAdapter
 import sys
 import json
 from datetime import datetime
@@ -9,6 +10,11 @@ class FinanceTrackerAPITester:
         self.tests_run = 0
         self.tests_passed = 0
         self.created_transaction_ids = []
+        # Reuse connections across tests instead of a new TLS handshake per request
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=10)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
 
     def run_test(self, name, method, endpoint, expected_status, data=None):
         """Run a single API test"""
@@ -21,13 +27,13 @@ class FinanceTrackerAPITester:
         
         try:
             if method == 'GET':
-                response = requests.get(url, headers=headers)
+                response = self.session.get(url, headers=headers)
             elif method == 'POST':
-                response = requests.post(url, json=data, headers=headers)
+                response = self.session.post(url, json=data, headers=headers)
             elif method == 'PUT':
-                response = requests.put(url, json=data, headers=headers)
+                response = self.session.put(url, json=data, headers=headers)
             elif method == 'DELETE':
-                response = requests.delete(url, headers=headers)
+                response = self.session.delete(url, headers=headers)
 
             success = response.status_code == expected_status
             if success:
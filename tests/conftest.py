@@ -0,0 +1,17 @@
+import os
+import sys
+
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+import server
+
+
+@pytest.fixture
+def mock_db(monkeypatch):
+    """Point the server at an in-memory MongoDB for the duration of a test"""
+    database = AsyncMongoMockClient()["test_database"]
+    monkeypatch.setattr(server, "db", database)
+    return database
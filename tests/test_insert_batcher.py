@@ -0,0 +1,90 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import server
+
+
+class RecordingCollection:
+    """Wraps a collection and records the size of every insert_many call"""
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.batches = []
+
+    async def insert_many(self, documents, **kwargs):
+        self.batches.append(len(documents))
+        return await self.collection.insert_many(documents, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.collection, name)
+
+
+@pytest.fixture
+def recording_db(mock_db, monkeypatch):
+    transactions = RecordingCollection(mock_db.transactions)
+    monkeypatch.setattr(server, "db", SimpleNamespace(transactions=transactions))
+    return transactions
+
+
+def test_lone_insert_is_flushed_after_window(recording_db):
+    async def scenario():
+        await server.start_insert_batcher()
+        await asyncio.wait_for(server.queue_insert({"id": "a"}), timeout=1)
+        await server.stop_insert_batcher()
+        return await recording_db.count_documents({})
+
+    assert asyncio.run(scenario()) == 1
+    assert recording_db.batches == [1]
+
+
+def test_burst_is_written_with_one_insert_many(recording_db):
+    async def scenario():
+        await server.start_insert_batcher()
+        await asyncio.gather(*(server.queue_insert({"id": str(i)}) for i in range(50)))
+        await server.stop_insert_batcher()
+        return await recording_db.count_documents({})
+
+    assert asyncio.run(scenario()) == 50
+    assert recording_db.batches == [50]
+
+
+def test_bulk_write_error_fails_only_matching_caller(recording_db):
+    async def scenario():
+        await recording_db.create_index("id", unique=True)
+        await recording_db.insert_one({"id": "dup"})
+        await server.start_insert_batcher()
+        results = await asyncio.gather(
+            server.queue_insert({"id": "first"}),
+            server.queue_insert({"id": "dup"}),
+            server.queue_insert({"id": "last"}),
+            return_exceptions=True
+        )
+        await server.stop_insert_batcher()
+        return results, await recording_db.count_documents({})
+
+    results, count = asyncio.run(scenario())
+    assert results[0] is None
+    assert isinstance(results[1], Exception)
+    assert results[2] is None
+    assert count == 3
+    assert recording_db.batches == [3]
+
+
+def test_shutdown_flushes_batch_being_collected(recording_db, monkeypatch):
+    # A long window guarantees the worker is still collecting when stopped
+    monkeypatch.setattr(server, "INSERT_BATCH_WINDOW", 10)
+
+    async def scenario():
+        await server.start_insert_batcher()
+        pending = asyncio.create_task(server.queue_insert({"id": "a"}))
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert server._insert_queue.empty()
+        await asyncio.wait_for(server.stop_insert_batcher(), timeout=1)
+        assert pending.done()
+        await pending
+        return await recording_db.count_documents({})
+
+    assert asyncio.run(scenario()) == 1
@@ -0,0 +1,31 @@
+import pytest
+
+import server
+
+
+@pytest.mark.parametrize("sender, message, amount, merchant, category", [
+    ("SBIINB", "Rs.250.00 debited at SWIGGY on 12-01", 250.0, "SWIGGY", "Food"),
+    ("HDFCBK", "Rs 1200 debited from HDFC Bank Card at AMAZON  STORE. Avl bal Rs 5000", 1200.0, "AMAZON STORE", "Shopping"),
+    ("ICICIB", "Rs.450.50 spent on ICICI Bank Card XX1234 at UBER on 2024-01-05", 450.5, "ICICI Bank", "Others"),
+    ("AXISBK", "INR 999 debited for Airtel Mobile Recharge at AIRTEL UPI ref 123", 999.0, "AIRTEL", "Others"),
+    (None, "Rs.300 paid to Dominos Pizza. Ref 5678", 300.0, "Dominos Pizza", "Food"),
+    # Merchants that changed when the per-bank patterns were merged
+    ("SBI", "Rs.500 debited to A/c at Biryani House on 03", 500.0, "A/c at Biryani House", "Food"),
+    ("SBI", "Rs.500 debited from A/c XX12 to Uber on 01-01", 500.0, "Uber", "Transport"),
+])
+def test_parse_bank_sms(sender, message, amount, merchant, category):
+    parsed = server.parse_sms_transaction(message, sender)
+
+    assert parsed["amount"] == amount
+    assert parsed["merchant"] == merchant
+    assert parsed["category"] == category
+    assert parsed["type"] == "expense"
+    assert parsed["source"] == "sms"
+
+
+@pytest.mark.parametrize("message", [
+    "Your OTP is 123456",
+    "You have paid Rs.300 to Dominos Pizza on 05-01",
+])
+def test_unparseable_sms_returns_none(message):
+    assert server.parse_sms_transaction(message) is None
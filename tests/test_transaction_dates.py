@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+import server
+from migrate_dates import migrate_string_dates
+
+
+def make_transaction(date, **overrides):
+    transaction = {
+        "amount": 100.0,
+        "description": "Test transaction",
+        "date": date,
+        "category": "Food",
+        "type": "expense"
+    }
+    transaction.update(overrides)
+    return transaction
+
+
+@pytest.fixture
+def client(mock_db):
+    with TestClient(server.app) as test_client:
+        yield test_client
+
+
+def test_date_round_trips_as_string(client):
+    response = client.post("/api/transactions", json=make_transaction("2024-01-05"))
+    assert response.status_code == 200
+    created = response.json()["transaction"]
+    assert created["date"] == "2024-01-05"
+
+    fetched = client.get(f"/api/transactions/{created['id']}").json()
+    assert fetched["date"] == "2024-01-05"
+
+    response = client.put(f"/api/transactions/{created['id']}", json={"date": "2024-02-10"})
+    assert response.status_code == 200
+    assert response.json()["transaction"]["date"] == "2024-02-10"
+
+    fetched = client.get(f"/api/transactions/{created['id']}").json()
+    assert fetched["date"] == "2024-02-10"
+
+
+def test_date_is_stored_as_bson_date(client, mock_db):
+    created = client.post("/api/transactions", json=make_transaction("2024-01-05")).json()["transaction"]
+
+    stored = asyncio.run(mock_db.transactions.find_one({"id": created["id"]}))
+    assert stored["date"].isoformat() == "2024-01-05T00:00:00"
+
+
+def test_malformed_date_is_rejected(client):
+    response = client.post("/api/transactions", json=make_transaction("05/01/2024"))
+    assert response.status_code == 422
+
+    created = client.post("/api/transactions", json=make_transaction("2024-01-05")).json()["transaction"]
+    response = client.put(f"/api/transactions/{created['id']}", json={"date": "not-a-date"})
+    assert response.status_code == 422
+
+
+def test_string_dated_rows_are_migrated_and_sorted(mock_db):
+    # Rows written before dates were stored as BSON dates
+    asyncio.run(mock_db.transactions.insert_many([
+        {**make_transaction("2024-03-01"), "id": "old-1"},
+        {**make_transaction("2023-12-31"), "id": "old-2"}
+    ]))
+
+    migrated = asyncio.run(migrate_string_dates(mock_db.transactions, batch_size=1))
+    assert migrated == 2
+
+    with TestClient(server.app) as client:
+        client.post("/api/transactions", json=make_transaction("2024-01-15"))
+        client.post("/api/transactions", json=make_transaction("2024-06-01"))
+        transactions = client.get("/api/transactions").json()["transactions"]
+
+    assert [t["date"] for t in transactions] == ["2024-06-01", "2024-03-01", "2024-01-15", "2023-12-31"]
+    old = asyncio.run(mock_db.transactions.find_one({"id": "old-1"}))
+    assert old["date"].isoformat() == "2024-03-01T00:00:00"
+
+
+@pytest.mark.parametrize("value", ["2024-01-05T01:00:00+05:30", "2024-01-05T23:30:00", "2024-01-05 10:00"])
+def test_date_with_time_or_offset_is_rejected(client, value):
+    response = client.post("/api/transactions", json=make_transaction(value))
+    assert response.status_code == 422
+
+
+def test_unparseable_legacy_dates_are_left_alone(mock_db):
+    asyncio.run(mock_db.transactions.insert_one({**make_transaction("05/01/2024"), "id": "bad"}))
+
+    assert asyncio.run(migrate_string_dates(mock_db.transactions)) == 0
+    stored = asyncio.run(mock_db.transactions.find_one({"id": "bad"}))
+    assert stored["date"] == "05/01/2024"